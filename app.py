@@ -2,6 +2,7 @@ from fastapi import FastAPI
 import json
 from utils.s3.core import get_s3_client ,read_markdown_from_s3
 from utils.langgraph.core import entry_point, generate_report_without_streaming
+from utils.store.core import get_store, ingest_links_file, select_sources
 import logging
 
 # Set up logging
@@ -18,7 +19,12 @@ async def report(mode: str):
     if mode=='Static':
         return {'markdown': read_markdown_from_s3(get_s3_client())}
     else: 
-        with open('links.json', 'r', encoding='utf-8') as file:
-            links_data = json.load(file)
-        llm_ready_data = entry_point(links_data)
+        conn = get_store()
+        try:
+            ingest_links_file(conn, 'links.json')
+            # Prefer recent pages, but don't come back empty-handed if the scraper has been idle
+            results = select_sources(conn) or select_sources(conn, max_age_days=None)
+        finally:
+            conn.close()
+        llm_ready_data = entry_point({'results': results})
         return {'markdown': generate_report_without_streaming(llm_ready_data)}
@@ -29,7 +29,7 @@ class AgentState(TypedDict):
     report_context: Annotated[Optional[str], "The final market report"]
     error: Annotated[Optional[str], "Error message if any"]
 
-def extract_and_analyze_data(json_data: Dict) -> Dict:
+def extract_and_analyze_data(json_data: Dict, max_context_chars: int = 120000) -> Dict:
     """Combined extraction and analysis in one API call - works directly with results array"""
     # Prepare consolidated text from all sources in the results array
     fallback_data = {
@@ -51,7 +51,12 @@ def extract_and_analyze_data(json_data: Dict) -> Dict:
             title = source.get("WEBPAGE_TITLE", "Unknown Title")
             content = source.get("WEBPAGE_CONTENT", "No content available")
             
-            consolidated_text += f"Source {i} - {title}:\n{content}\n\n"
+            source_text = f"Source {i} - {title}:\n{content}\n\n"
+            # Keep the prompt bounded no matter how many sources the caller passes in
+            if len(consolidated_text) + len(source_text) > max_context_chars:
+                logger.info(f"Context budget reached, skipping remaining sources from source {i}")
+                break
+            consolidated_text += source_text
     else:
         logger.warning("Input data doesn't have expected 'results' array structure")
         return fallback_data
@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+# Configure logging
+logging.basicConfig(
+    format="%(asctime)s - %(message)s",
+    level=logging.INFO
+)
+logger = logging.getLogger(__name__)
+
+STORE_PATH = 'local/sources.db'
+DEFAULT_QUERY = 'S&P 500 stock market Dow Nasdaq index stocks gains losses tariffs earnings sector'
+
+def get_store(path=STORE_PATH):
+    """Open the local source store, creating the tables and BM25 index on first use"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS sources (
+            id INTEGER PRIMARY KEY,
+            url TEXT UNIQUE NOT NULL,
+            title TEXT,
+            content TEXT,
+            content_hash TEXT,
+            scraped_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sources_scraped_at ON sources(scraped_at);
+        CREATE VIRTUAL TABLE IF NOT EXISTS sources_fts USING fts5(
+            title, content, content='sources', content_rowid='id', tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS sources_ai AFTER INSERT ON sources BEGIN
+            INSERT INTO sources_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS sources_ad AFTER DELETE ON sources BEGIN
+            INSERT INTO sources_fts(sources_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS sources_au AFTER UPDATE ON sources BEGIN
+            INSERT INTO sources_fts(sources_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO sources_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END;
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+    """)
+    return conn
+
+def ingest_sources(conn, results, scraped_at=None):
+    """Append scraped pages to the store, deduplicated by URL. Returns the number of new or changed rows"""
+    scraped_at = scraped_at or time.time()
+    written = 0
+    with conn:
+        for source in results:
+            if not source or not source.get('WEBPAGE_URL'):
+                continue
+            title = source.get('WEBPAGE_TITLE', 'Unknown Title')
+            content = source.get('WEBPAGE_CONTENT', '')
+            content_hash = hashlib.sha1(f"{title}\n{content}".encode('utf-8')).hexdigest()
+            # Only touch the row (and the index) when the page is new or its content changed
+            cursor = conn.execute("""
+                INSERT INTO sources (url, title, content, content_hash, scraped_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    title=excluded.title, content=excluded.content,
+                    content_hash=excluded.content_hash, scraped_at=excluded.scraped_at
+                WHERE sources.content_hash != excluded.content_hash
+            """, (source['WEBPAGE_URL'], title, content, content_hash, scraped_at))
+            written += cursor.rowcount
+    return written
+
+def ingest_links_file(conn, path='links.json'):
+    """Ingest a scraper dump such as links.json, skipping the parse when the file is unchanged since the last run"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        logger.warning(f"Source file {path} not found, using the existing store")
+        return 0
+    seen = conn.execute("SELECT mtime, size FROM ingested_files WHERE path = ?", (path,)).fetchone()
+    if seen and seen['mtime'] == stat.st_mtime and seen['size'] == stat.st_size:
+        return 0
+    with open(path, 'r', encoding='utf-8') as file:
+        links_data = json.load(file)
+    results = links_data.get('results', []) if isinstance(links_data, dict) else []
+    written = ingest_sources(conn, results, scraped_at=stat.st_mtime)
+    with conn:
+        conn.execute("""
+            INSERT INTO ingested_files (path, mtime, size) VALUES (?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET mtime=excluded.mtime, size=excluded.size
+        """, (path, stat.st_mtime, stat.st_size))
+    logger.info(f"Ingested {written} new or updated sources from {path}")
+    return written
+
+def _fts_query(query):
+    """Turn free text into an FTS5 OR-query of quoted terms so punctuation can't break the syntax"""
+    terms = dict.fromkeys(term.lower() for term in re.findall(r'\w+', query))
+    return ' OR '.join(f'"{term}"' for term in terms)
+
+def select_sources(conn, query=DEFAULT_QUERY, top_k=10, token_budget=30000, max_age_days=7, half_life_days=1.0):
+    """Return the top-K most relevant, most recent sources that fit in the token budget, in links.json format"""
+    match = _fts_query(query)
+    if not match:
+        return []
+    now = time.time()
+    min_scraped_at = now - max_age_days * 86400 if max_age_days else 0
+    # bm25() is lower-is-better; pull a wider candidate pool and re-rank it with a recency decay
+    rows = conn.execute("""
+        SELECT s.url, s.title, s.content, s.scraped_at, bm25(sources_fts, 2.0, 1.0) AS rank
+        FROM sources_fts JOIN sources s ON s.id = sources_fts.rowid
+        WHERE sources_fts MATCH ? AND s.scraped_at >= ?
+        ORDER BY rank
+        LIMIT ?
+    """, (match, min_scraped_at, top_k * 5)).fetchall()
+
+    def score(row):
+        age_days = max(now - row['scraped_at'], 0) / 86400
+        return -row['rank'] * 0.5 ** (age_days / half_life_days)
+
+    selected, used_tokens = [], 0
+    for row in sorted(rows, key=score, reverse=True):
+        if len(selected) >= top_k:
+            break
+        # Rough estimate of ~4 characters per token, good enough for budgeting the prompt
+        tokens = (len(row['title'] or '') + len(row['content'] or '')) // 4
+        if used_tokens + tokens > token_budget:
+            continue
+        used_tokens += tokens
+        selected.append({
+            'WEBPAGE_TITLE': row['title'],
+            'WEBPAGE_URL': row['url'],
+            'WEBPAGE_CONTENT': row['content']
+        })
+    logger.info(f"Selected {len(selected)} of {len(rows)} matching sources (~{used_tokens} tokens)")
+    return selected